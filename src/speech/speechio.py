@@ -1,11 +1,31 @@
 from io import BytesIO
-from typing import ClassVar, Mapping, Optional, Protocol, cast
+from typing import (
+    Awaitable,
+    Callable,
+    ClassVar,
+    Deque,
+    Dict,
+    List,
+    Mapping,
+    Optional,
+    Protocol,
+    Union,
+    cast,
+)
+from collections import deque
 from enum import Enum
 import os
+import queue
 import re
 import json
 import asyncio
+import base64
 import hashlib
+import tempfile
+import threading
+import time
+from concurrent.futures import Future
+from functools import lru_cache, partial
 from typing_extensions import Self
 
 from viam.module.types import Reconfigurable
@@ -16,14 +36,11 @@ from viam.resource.types import Model
 from viam.logging import getLogger
 from viam.utils import struct_to_dict
 
-import pygame
 from pygame import mixer
-from elevenlabs.client import ElevenLabs
-from elevenlabs import save as eleven_save
-from gtts import gTTS
-import openai
 import speech_recognition as sr
-from pydub import AudioSegment
+
+# provider SDKs (elevenlabs, gtts, openai, pydub) are imported where they are used,
+# so providers that are not configured are never loaded
 
 from speech_service_api import SpeechService
 
@@ -45,13 +62,101 @@ class RecState:
     listen_closer: Optional[Closer] = None
     mic: Optional[sr.Microphone] = None
     rec: Optional[sr.Recognizer] = None
+    mic_config: Optional[tuple] = None
 
 
 LOGGER = getLogger(__name__)
 CACHEDIR = "/tmp/cache"
+# streamed completions are spoken a sentence at a time, split after terminal punctuation
+SENTENCE_END_RE = re.compile(r"(?<=[.!?])\s+")
+TRIGGER_TYPES = frozenset({"command", "completion", "say"})
+# characters outside this set are stripped from completions before they are spoken
+COMPLETION_STRIP_RE = re.compile(r"[^0-9a-zA-Z.!?,:'/ ]+")
 
 rec_state = RecState()
 
+
+def trigger_pattern(trigger: str) -> re.Pattern:
+    """Compile ``trigger`` to match case-insensitively, only when followed by whitespace or the end of the text."""
+    return re.compile(re.escape(trigger) + r"(?=\s|$)", re.IGNORECASE)
+
+
+def strip_trigger(heard: str, trigger: re.Pattern) -> str:
+    """Return the text following the first match of ``trigger`` in ``heard``, or ``heard`` unchanged if absent."""
+    match = trigger.search(heard)
+    if match is None:
+        return heard
+    return heard[match.end() :].lstrip()
+
+
+def find_microphone(name: str) -> sr.Microphone:
+    """Return the microphone called ``name`` (or the default one) from a fresh device scan.
+
+    Device indexes shift as devices come and go, so they are never reused across scans;
+    callers only get here when the mic settings change.
+    """
+    mics = sr.Microphone.list_microphone_names()
+    LOGGER.info(mics)
+
+    if name == "":
+        return sr.Microphone()
+    if name not in mics:
+        raise ValueError("Microphone device '" + name + "' not found")
+    return sr.Microphone(mics.index(name))
+
+
+@lru_cache(maxsize=256)
+def cache_file(prefix: str, text: str, ext: str) -> str:
+    """Return the cache path for ``text`` under ``prefix``, sharded into two-character subdirectories of CACHEDIR."""
+    # the separator keeps ("ab", "c") and ("a", "bc") from sharing a key
+    digest = hashlib.blake2b((prefix + "\0" + text).encode(), digest_size=16).digest()
+    key = base64.urlsafe_b64encode(digest).rstrip(b"=").decode()
+    return os.path.join(CACHEDIR, key[:2], key + ext)
+
+
+def write_cache_file(file: str, data: bytes) -> None:
+    """Atomically write ``data`` to ``file`` so concurrent readers never see a partial cache entry."""
+    directory = os.path.dirname(file)
+    os.makedirs(directory, exist_ok=True)
+    with tempfile.NamedTemporaryFile(dir=directory, delete=False) as f:
+        f.write(data)
+    os.replace(f.name, file)
+
+
+def clean_completion(completion: str) -> str:
+    """Reduce a completion to lowercase text that reads well when spoken."""
+    completion = COMPLETION_STRIP_RE.sub("", completion).lower()
+    return completion.replace("as an ai language model", "")
+
+
+def read_cache_file(file: str) -> str:
+    with open(file) as f:
+        return f.read()
+
+
+def load_energy_threshold(file: str, ttl: float) -> Optional[float]:
+    """Return the energy threshold saved in ``file``, or None if there is none younger than ``ttl`` seconds."""
+    try:
+        with open(file) as f:
+            saved = json.load(f)
+        if time.time() - saved["ts"] > ttl:
+            return None
+        return float(saved["energy_threshold"])
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
+
+
+def save_energy_threshold(file: str, energy_threshold: float) -> None:
+    """Save ``energy_threshold`` to ``file``; failing to save only costs a recalibration next time."""
+    try:
+        write_cache_file(
+            file,
+            json.dumps({"energy_threshold": energy_threshold, "ts": time.time()}).encode(),
+        )
+    except OSError as e:
+        LOGGER.warning("speechio could not save mic calibration: " + str(e))
+
+
 class SpeechIOService(SpeechService, Reconfigurable):
     """This is the specific implementation of a ``SpeechService`` (defined in api.py)
 
@@ -76,73 +181,143 @@ class SpeechIOService(SpeechService, Reconfigurable):
     listen_trigger_command: str
     listen_command_buffer_length: int
     mic_device_name: str
-    command_list: list
+    ambient_calibration_seconds: float
+    ambient_calibration_ttl_seconds: float
+    command_list: Deque[str]
     trigger_active: bool
     active_trigger_type: str
     disable_mic: bool
     disable_audioout: bool
     eleven_client: dict = {}
+    completion_client: dict = {}
+
+    def __init__(self, name: str):
+        super().__init__(name)
+        # listen_callback runs on speech_recognition's listener thread; coroutines it
+        # starts are scheduled on this long-lived loop rather than a new loop per utterance
+        self._callback_loop = asyncio.new_event_loop()
+        self._callback_thread = threading.Thread(
+            target=self._callback_loop.run_forever, daemon=True
+        )
+        self._callback_thread.start()
+        self._closed = False
+        self._cache_ahead_tasks: Dict[str, asyncio.Future] = {}
+        self._playback_queue: queue.Queue = queue.Queue()
+        self._playback_closed = threading.Event()
+        # queued and in-progress utterances, settled before their playback future resolves
+        self._pending_speech = 0
+        self._pending_speech_lock = threading.Lock()
+        self._playback_thread = threading.Thread(
+            target=self._playback_loop, daemon=True
+        )
+        self._playback_thread.start()
 
     @classmethod
     def new(
         cls, config: ComponentConfig, dependencies: Mapping[ResourceName, ResourceBase]
     ) -> Self:
         speechio = cls(config.name)
-        speechio.reconfigure(config, dependencies)
-
-        LOGGER.debug(json.dumps(speechio.__dict__))
+        try:
+            speechio.reconfigure(config, dependencies)
+        except Exception:
+            # nothing will ever close a resource that failed to configure, so stop its workers here
+            speechio._closed = True
+            speechio._stop_workers()
+            raise
+
+        LOGGER.debug(json.dumps(speechio.__dict__, default=str))
         return speechio
 
     async def say(self, text: str, blocking: bool, cache_only: bool = False) -> str:
-        if str == "":
+        try:
+            playback = await self._queue_speech(text, cache_only)
+            if blocking and playback is not None:
+                await asyncio.wrap_future(playback)
+        except RuntimeError:
+            raise ValueError("say() speech failure")
+
+        return text
+
+    async def _queue_speech(self, text: str, cache_only: bool) -> Optional[Future]:
+        if text == "":
             raise ValueError("No text provided")
 
+        if not cache_only and not mixer.get_init():
+            raise ValueError("say() audio output is disabled")
+
         LOGGER.info("Generating audio...")
-        if not os.path.isdir(CACHEDIR):
-            os.mkdir(CACHEDIR)
-
-        file = os.path.join(
-            CACHEDIR,
-            self.speech_provider.value
-            + self.speech_voice
-            + self.completion_persona
-            + hashlib.md5(text.encode()).hexdigest()
-            + ".mp3",
-        )
-        try:
-            if not os.path.isfile(file):  # read from cache if it exists
-                if self.speech_provider == "elevenlabs":
-                    audio = self.eleven_client["client"].generate(text=text, voice=self.speech_voice)
-                    eleven_save(audio=audio, filename=file)
-                else:
-                    sp = gTTS(text=text, lang="en", slow=False)
-                    sp.save(file)
+        file = cache_file(self._say_cache_prefix, text, ".mp3")
+        source: Union[str, BytesIO] = file
+        if not os.path.isfile(file):  # read from cache if it exists
+            loop = asyncio.get_running_loop()
+            data = await loop.run_in_executor(None, self._synthesize, text)
+            # play straight from memory and persist to the cache off the event loop
+            write = loop.run_in_executor(None, write_cache_file, file, data)
+            if cache_only:
+                # filling the cache is the whole point of a cache_only call
+                await write
+                return None
+            write.add_done_callback(self._log_background_failure)
+            source = BytesIO(data)
 
-            if not cache_only:
-                mixer.music.load(file)
+        if cache_only:
+            return None
+        # playback runs on its own thread so the next utterance can be synthesized meanwhile
+        playback: Future = Future()
+        with self._pending_speech_lock:
+            self._pending_speech += 1
+        self._playback_queue.put((source, playback))
+        return playback
+
+    def _playback_loop(self) -> None:
+        while True:
+            item = self._playback_queue.get()
+            if item is None:
+                return
+            source, playback = item
+            # skip clips whose caller gave up, or that were queued before close()
+            if self._playback_closed.is_set() or not playback.set_running_or_notify_cancel():
+                self._finish_speech()
+                continue
+            try:
+                if isinstance(source, str):
+                    mixer.music.load(source)
+                else:
+                    mixer.music.load(source, "mp3")
                 LOGGER.info("Playing audio...")
                 mixer.music.play()  # Play it
-
-                if blocking:
-                    while mixer.music.get_busy():
-                        pygame.time.Clock().tick()
-
+                while mixer.music.get_busy():
+                    if self._playback_closed.is_set():
+                        mixer.music.stop()
+                        break
+                    time.sleep(0.02)
                 LOGGER.info("Played audio...")
-        except RuntimeError:
-            raise ValueError("say() speech failure")
+            except Exception as e:
+                # keep the worker alive; the failure is reported to whoever waits on it
+                LOGGER.error("speechio playback failed: " + str(e))
+                self._finish_speech()
+                playback.set_exception(e)
+            else:
+                self._finish_speech()
+                playback.set_result(None)
 
-        return text
+    def _finish_speech(self) -> None:
+        # must run before the playback future resolves, so a blocking say()
+        # never returns while is_speaking() still reports it
+        with self._pending_speech_lock:
+            self._pending_speech -= 1
 
     async def listen_trigger(self, type: str) -> str:
         if type == "":
             raise ValueError("No trigger type provided")
-        if type in ["command", "completion", "say"]:
+        if type in TRIGGER_TYPES:
             self.active_trigger_type = type
             self.trigger_active = True
-            if self.should_listen:
-                # close and re-open listener so any in-progress speech is not captured
-                if rec_state.listen_closer is not None:
-                    rec_state.listen_closer(True)
+            # close and re-open listener so any in-progress speech is not captured,
+            # and so a listener left over from an unfired trigger does not keep the mic open
+            if rec_state.listen_closer is not None:
+                rec_state.listen_closer(True)
+                rec_state.listen_closer = None
             if rec_state.rec is not None and rec_state.mic is not None:
                 rec_state.listen_closer = rec_state.rec.listen_in_background(
                     source=rec_state.mic,
@@ -155,7 +330,8 @@ class SpeechIOService(SpeechService, Reconfigurable):
         return "OK"
 
     async def is_speaking(self) -> bool:
-        return mixer.music.get_busy()
+        with self._pending_speech_lock:
+            return self._pending_speech > 0
 
     async def completion(
         self, text: str, blocking: bool, cache_only: bool = False
@@ -168,51 +344,140 @@ class SpeechIOService(SpeechService, Reconfigurable):
             )
 
         completion = ""
-        file = os.path.join(
-            CACHEDIR,
-            self.speech_provider.value
-            + self.completion_persona
-            + hashlib.md5(text.encode()).hexdigest()
-            + ".txt",
-        )
+        file = cache_file(self._completion_cache_prefix, text, ".txt")
         if not cache_only and (self.cache_ahead_completions):
             LOGGER.info("Will try to read completion from cache")
             if os.path.isfile(file):
                 LOGGER.info("Cache file exists")
-                with open(file) as f:
-                    completion = f.read()
+                completion = await asyncio.get_running_loop().run_in_executor(
+                    None, read_cache_file, file
+                )
                 LOGGER.info(completion)
 
             # now cache next one
-            asyncio.ensure_future(self.completion(text, blocking, True))
+            self._cache_ahead(file, lambda: self.completion(text, blocking, True))
 
         if completion == "":
             LOGGER.info("Getting completion...")
             if self.completion_persona != "":
-                text = "As " + self.completion_persona + " respond to '" + text + "'"
-            completion = openai.chat.completions.create(
-                model=self.completion_model,
-                max_tokens=1024,
-                messages=[{"role": "user", "content": text}],
+                text = self._persona_prompt_prefix + text + "'"
+            if not cache_only:
+                # fail before paying for a completion that cannot be spoken
+                if not mixer.get_init():
+                    raise ValueError("completion() audio output is disabled")
+                # speak each sentence as it arrives instead of waiting for the full reply
+                completion = await self._stream_completion(text, blocking)
+                LOGGER.info("Got completion...")
+                return completion
+
+            completion = await asyncio.get_running_loop().run_in_executor(
+                None,
+                partial(
+                    self.completion_client["client"].chat.completions.create,
+                    model=self.completion_model,
+                    max_tokens=1024,
+                    messages=[{"role": "user", "content": text}],
+                ),
             )
-            completion = completion.choices[0].message.content
-            completion = re.sub("[^0-9a-zA-Z.!?,:'/ ]+", "", completion).lower()
-            completion = completion.replace("as an ai language model", "")
+            completion = clean_completion(completion.choices[0].message.content)
             LOGGER.info("Got completion...")
 
         if cache_only:
-            with open(file, "w") as f:
-                f.write(completion)
-            asyncio.ensure_future(self.say(completion, blocking, True))
+            await asyncio.get_running_loop().run_in_executor(
+                None, write_cache_file, file, completion.encode()
+            )
+            self._cache_ahead(
+                cache_file(self._say_cache_prefix, completion, ".mp3"),
+                lambda: self.say(completion, blocking, True),
+            )
         else:
             await self.say(completion, blocking)
         return completion
 
+    async def _stream_completion(self, prompt: str, blocking: bool) -> str:
+        loop = asyncio.get_running_loop()
+        sentences: asyncio.Queue = asyncio.Queue()
+
+        def receive() -> str:
+            # runs in the executor, handing each finished sentence to the loop
+            received = []
+            pending = ""
+            try:
+                stream = self.completion_client["client"].chat.completions.create(
+                    model=self.completion_model,
+                    max_tokens=1024,
+                    messages=[{"role": "user", "content": prompt}],
+                    stream=True,
+                )
+                for chunk in stream:
+                    if not chunk.choices:
+                        continue
+                    delta = chunk.choices[0].delta.content or ""
+                    received.append(delta)
+                    *finished, pending = SENTENCE_END_RE.split(pending + delta)
+                    for sentence in finished:
+                        loop.call_soon_threadsafe(sentences.put_nowait, sentence)
+                loop.call_soon_threadsafe(sentences.put_nowait, pending)
+            finally:
+                loop.call_soon_threadsafe(sentences.put_nowait, None)
+            return "".join(received)
+
+        async def speak() -> List[Future]:
+            playbacks: List[Future] = []
+            while True:
+                sentence = await sentences.get()
+                if sentence is None:
+                    return playbacks
+                sentence = clean_completion(sentence).strip()
+                # punctuation-only fragments such as "..." have nothing to say, and gTTS rejects them
+                if not any(c.isalnum() for c in sentence):
+                    continue
+                try:
+                    # queue without waiting so the next sentence is synthesized during playback
+                    playbacks.append(await self._queue_speech(sentence, False))
+                except Exception as e:
+                    # one failed sentence should not silence the rest of the reply
+                    LOGGER.error("speechio could not speak sentence: " + str(e))
+                    failed: Future = Future()
+                    failed.set_exception(e)
+                    playbacks.append(failed)
+
+        speaker = asyncio.ensure_future(speak())
+        try:
+            completion = await loop.run_in_executor(None, receive)
+        except BaseException:
+            speaker.cancel()
+            raise
+        if not blocking:
+            speaker.add_done_callback(self._log_background_failure)
+        else:
+            # wait for every sentence, then report the first one that failed
+            failure = None
+            for playback in await speaker:
+                try:
+                    await asyncio.wrap_future(playback)
+                except Exception as e:
+                    failure = failure or e
+            if failure is not None:
+                raise ValueError("completion() speech failure: " + str(failure))
+        return clean_completion(completion)
+
+    def _cache_ahead(self, file: str, fill: Callable[[], Awaitable]) -> None:
+        # coalesce background fills of the same cache entry so repeated requests
+        # do not each trigger another provider call
+        if file in self._cache_ahead_tasks:
+            return
+        task = asyncio.ensure_future(fill())
+        self._cache_ahead_tasks[file] = task
+        task.add_done_callback(lambda _: self._cache_ahead_tasks.pop(file, None))
+
     async def get_commands(self, number: int) -> list:
         LOGGER.info("will get " + str(number) + " commands from command list")
-        to_return = self.command_list[0:number]
+        to_return = [
+            self.command_list.popleft()
+            for _ in range(min(number, len(self.command_list)))
+        ]
         LOGGER.debug("to return from command_list: " + str(to_return))
-        del self.command_list[0:number]
         return to_return
 
     async def listen(self) -> str:
@@ -232,69 +497,92 @@ class SpeechIOService(SpeechService, Reconfigurable):
             return await self.stt.to_text(speech, format)
 
         if rec_state.rec is not None:
-            # speech_recognition expects WAV so we need to convert mp3
-            sound_out = BytesIO(speech)
-
-            if format != "wav":
-                sound = AudioSegment.from_mp3(sound_out)
-                sound_out = BytesIO()
-                sound.export(sound_out, format=format)
+            if format == "wav":
+                with sr.AudioFile(BytesIO(speech)) as source:
+                    audio = rec_state.rec.record(source)
+            else:
+                from pydub import AudioSegment
 
-            with sr.AudioFile(sound_out) as source:
-                audio = rec_state.rec.record(source)
+                # decode straight to mono PCM rather than re-encoding to WAV for sr.AudioFile
+                sound = AudioSegment.from_file(BytesIO(speech), format=format).set_channels(1)
+                audio = sr.AudioData(sound.raw_data, sound.frame_rate, sound.sample_width)
             return await self.convert_audio_to_text(audio)
 
         return ""
 
     async def to_speech(self, text):
-        if self.speech_provider == "elevenlabs":
+        return await asyncio.get_running_loop().run_in_executor(
+            None, self._synthesize, text
+        )
+
+    def _synthesize(self, text: str) -> bytes:
+        if self.speech_provider is SpeechProvider.elevenlabs:
             audio = self.eleven_client["client"].generate(text=text, voice=self.speech_voice)
-            return audio
+            # elevenlabs may hand back the mp3 as a stream of chunks
+            return audio if isinstance(audio, bytes) else b"".join(audio)
         else:
+            from gtts import gTTS
+
             mp3_fp = BytesIO()
             sp = gTTS(text=text, lang="en", slow=False)
             sp.write_to_fp(mp3_fp)
             return mp3_fp.getvalue()
 
     def listen_callback(self, recognizer, audio):
-        heard = asyncio.run(self.convert_audio_to_text(audio))
+        heard = asyncio.run_coroutine_threadsafe(
+            self.convert_audio_to_text(audio), self._callback_loop
+        ).result()
         LOGGER.error("speechio heard " + heard)
 
         if heard != "":
-            if (
-                self.should_listen and re.search(".*" + self.listen_trigger_say, heard)
-            ) or (self.trigger_active and self.active_trigger_type == "say"):
+            # triggers match case-insensitively, but payloads keep the transcript's case;
+            # a trigger with nothing after it is not dispatched
+            if (self.should_listen and self._trigger_say.search(heard)) or (
+                self.trigger_active and self.active_trigger_type == "say"
+            ):
                 self.trigger_active = False
-                to_say = re.sub(".*" + self.listen_trigger_say + "\s+", "", heard)
-                asyncio.run(self.say(to_say, blocking=False))
-            elif (
-                self.should_listen
-                and re.search(".*" + self.listen_trigger_completion, heard)
-            ) or (self.trigger_active and self.active_trigger_type == "completion"):
+                to_say = strip_trigger(heard, self._trigger_say)
+                if to_say != "":
+                    self._run_in_background(self.say(to_say, blocking=False))
+            elif (self.should_listen and self._trigger_completion.search(heard)) or (
+                self.trigger_active and self.active_trigger_type == "completion"
+            ):
                 self.trigger_active = False
-                to_say = re.sub(
-                    ".*" + self.listen_trigger_completion + "\s+", "", heard
-                )
-                asyncio.run(self.completion(to_say, blocking=False))
-            elif (
-                self.should_listen
-                and re.search(".*" + self.listen_trigger_command, heard)
-            ) or (self.trigger_active and self.active_trigger_type == "command"):
+                to_say = strip_trigger(heard, self._trigger_completion)
+                if to_say != "":
+                    self._run_in_background(self.completion(to_say, blocking=False))
+            elif (self.should_listen and self._trigger_command.search(heard)) or (
+                self.trigger_active and self.active_trigger_type == "command"
+            ):
                 self.trigger_active = False
-                command = re.sub(".*" + self.listen_trigger_command + "\s+", "", heard)
-                self.command_list.insert(0, command)
-                LOGGER.debug("added to command_list: '" + command + "'")
-                del self.command_list[self.listen_command_buffer_length :]
+                command = strip_trigger(heard, self._trigger_command)
+                if command != "":
+                    # the deque's maxlen drops the oldest command once the buffer is full
+                    self.command_list.appendleft(command)
+                    LOGGER.debug("added to command_list: '" + command + "'")
             if not self.should_listen:
                 # stop listening if not in background listening mode
                 LOGGER.debug("will close background listener")
                 if rec_state.listen_closer is not None:
-                    rec_state.listen_closer()
+                    # we are running on the listener thread, so it cannot be joined here
+                    rec_state.listen_closer(False)
+                    rec_state.listen_closer = None
+
+    def _run_in_background(self, coro) -> None:
+        future = asyncio.run_coroutine_threadsafe(coro, self._callback_loop)
+        future.add_done_callback(self._log_background_failure)
+
+    @staticmethod
+    def _log_background_failure(future: Union[Future, asyncio.Future]) -> None:
+        if not future.cancelled() and future.exception() is not None:
+            LOGGER.error("speechio background task failed: " + str(future.exception()))
 
     async def convert_audio_to_text(self, audio: sr.AudioData) -> str:
 
+        loop = asyncio.get_running_loop()
         if self.stt is not None:
-            return await self.stt.to_text(audio.get_wav_data(), format="wav")
+            wav_data = await loop.run_in_executor(None, audio.get_wav_data)
+            return await self.stt.to_text(wav_data, format="wav")
 
         heard = ""
 
@@ -302,7 +590,9 @@ class SpeechIOService(SpeechService, Reconfigurable):
             # for testing purposes, we're just using the default API key
             # to use another API key, use `r.recognize_google(audio, key="GOOGLE_SPEECH_RECOGNITION_API_KEY")`
             # instead of `r.recognize_google(audio)`
-            transcript = rec_state.rec.recognize_google(audio, show_all=True)
+            transcript = await loop.run_in_executor(
+                None, partial(rec_state.rec.recognize_google, audio, show_all=True)
+            )
             if type(transcript) is dict and transcript.get("alternative"):
                 heard = transcript["alternative"][0]["transcript"]
         except sr.UnknownValueError:
@@ -315,6 +605,37 @@ class SpeechIOService(SpeechService, Reconfigurable):
             )
         return heard
 
+    async def close(self):
+        # close() may be called more than once; the workers can only be stopped once
+        if self._closed:
+            return
+        self._closed = True
+        loop = asyncio.get_running_loop()
+        if rec_state.listen_closer is not None:
+            await loop.run_in_executor(None, rec_state.listen_closer, True)
+            rec_state.listen_closer = None
+        await loop.run_in_executor(None, self._stop_workers)
+
+    def _stop_workers(self) -> None:
+        self._callback_loop.call_soon_threadsafe(self._callback_loop.stop)
+        self._callback_thread.join()
+        self._callback_loop.close()
+
+        # stop speaking now instead of playing out whatever is still queued
+        self._playback_closed.set()
+        while True:
+            try:
+                item = self._playback_queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is not None:
+                self._finish_speech()
+                item[1].cancel()
+        if mixer.get_init():
+            mixer.music.stop()
+        self._playback_queue.put(None)
+        self._playback_thread.join()
+
     def reconfigure(
         self, config: ComponentConfig, dependencies: Mapping[ResourceName, ResourceBase]
     ):
@@ -330,10 +651,23 @@ class SpeechIOService(SpeechService, Reconfigurable):
         self.completion_model = str(attrs.get("completion_model", "gpt-4o"))
         self.completion_provider_org = str(attrs.get("completion_provider_org", ""))
         self.completion_provider_key = str(attrs.get("completion_provider_key", ""))
-        if self.completion_provider == "openai":
-            openai.api_key = self.completion_provider_key
-            openai.organization = self.completion_provider_org
+        if (
+            self.completion_provider is CompletionProvider.openai
+            and self.completion_provider_key != ""
+        ):
+            # completion() rejects calls without a key, so only import openai once one is set;
+            # keep the existing client (and its connection pool) if the credentials are unchanged
+            credentials = (self.completion_provider_key, self.completion_provider_org)
+            if self.completion_client.get("credentials") != credentials:
+                from openai import OpenAI
+
+                self.completion_client["client"] = OpenAI(
+                    api_key=self.completion_provider_key,
+                    organization=self.completion_provider_org or None,
+                )
+                self.completion_client["credentials"] = credentials
         self.completion_persona = str(attrs.get("completion_persona", ""))
+        self._persona_prompt_prefix = "As " + self.completion_persona + " respond to '"
         self.listen_provider = str(attrs.get("listen_provider", "google"))
         self.should_listen = bool(attrs.get("listen", False))
         self.listen_phrase_time_limit = attrs.get("listen_phrase_time_limit", None)
@@ -345,27 +679,49 @@ class SpeechIOService(SpeechService, Reconfigurable):
         self.listen_trigger_command = str(
             attrs.get("listen_trigger_command", "robot can you")
         )
+        self._trigger_say = trigger_pattern(self.listen_trigger_say)
+        self._trigger_completion = trigger_pattern(self.listen_trigger_completion)
+        self._trigger_command = trigger_pattern(self.listen_trigger_command)
         self.listen_command_buffer_length = int(
             attrs.get("listen_command_buffer_length", 10)
         )
         self.cache_ahead_completions = bool(attrs.get("cache_ahead_completions", False))
         self.disable_mic = bool(attrs.get("disable_mic", False))
+        self.ambient_calibration_seconds = float(
+            attrs.get("ambient_calibration_seconds", 2)
+        )
+        self.ambient_calibration_ttl_seconds = float(
+            attrs.get("ambient_calibration_ttl_seconds", 86400)
+        )
         self.disable_audioout = bool(attrs.get("disable_audioout", False))
-        self.command_list = []
+        self.command_list = deque(maxlen=self.listen_command_buffer_length)
         self.trigger_active = False
         self.active_trigger_type = ""
         self.stt = None
 
         if (
-            self.speech_provider == SpeechProvider.elevenlabs
+            self.speech_provider is SpeechProvider.elevenlabs
             and self.speech_provider_key != ""
         ):
-            self.eleven_client["client"] = ElevenLabs(
-                api_key = self.speech_provider_key
-            )
+            # keep the existing client (and its connection pool) if the key is unchanged
+            if self.eleven_client.get("key") != self.speech_provider_key:
+                from elevenlabs.client import ElevenLabs
+
+                self.eleven_client["client"] = ElevenLabs(
+                    api_key = self.speech_provider_key
+                )
+                self.eleven_client["key"] = self.speech_provider_key
         else:
             self.speech_provider = SpeechProvider.google
 
+        # cache keys only change on reconfigure, so build their prefixes once here
+        self._say_cache_prefix = (
+            self.speech_provider.value + self.speech_voice + self.completion_persona
+        )
+        self._completion_cache_prefix = (
+            self.speech_provider.value + self.completion_persona
+        )
+
         if self.listen_provider != "google":
             stt = dependencies[SpeechService.get_resource_name(self.listen_provider)]
             self.stt = cast(SpeechService, stt)
@@ -377,24 +733,39 @@ class SpeechIOService(SpeechService, Reconfigurable):
             if mixer.get_init():
                 mixer.quit()
 
-        rec_state.rec = sr.Recognizer()
+        # stop any background listener; it is restarted below with the new settings
+        if rec_state.listen_closer is not None:
+            rec_state.listen_closer(True)
+            rec_state.listen_closer = None
 
-        if not self.disable_mic:
-            # set up speech recognition
-            if rec_state.listen_closer is not None:
-                rec_state.listen_closer(True)
+        if rec_state.rec is None:
+            rec_state.rec = sr.Recognizer()
             rec_state.rec.dynamic_energy_threshold = True
 
-            mics = sr.Microphone.list_microphone_names()
-            LOGGER.info(mics)
-
-            if self.mic_device_name != "":
-                rec_state.mic = sr.Microphone(mics.index(self.mic_device_name))
-            else:
-                rec_state.mic = sr.Microphone()
-
-            with rec_state.mic as source:
-                rec_state.rec.adjust_for_ambient_noise(source, 2)
+        if self.disable_mic:
+            rec_state.mic = None
+            rec_state.mic_config = None
+        else:
+            # opening the mic and calibrating blocks for several seconds, so only
+            # redo it when the mic settings actually change
+            mic_config = (self.mic_device_name, self.ambient_calibration_seconds)
+            if rec_state.mic is None or rec_state.mic_config != mic_config:
+                rec_state.mic = find_microphone(self.mic_device_name)
+                calibration_file = cache_file("mic_calibration", repr(mic_config), ".json")
+                energy_threshold = load_energy_threshold(
+                    calibration_file, self.ambient_calibration_ttl_seconds
+                )
+                if energy_threshold is not None:
+                    rec_state.rec.energy_threshold = energy_threshold
+                else:
+                    with rec_state.mic as source:
+                        rec_state.rec.adjust_for_ambient_noise(
+                            source, self.ambient_calibration_seconds
+                        )
+                    save_energy_threshold(
+                        calibration_file, rec_state.rec.energy_threshold
+                    )
+                rec_state.mic_config = mic_config
 
             # set up background listening if desired
             if self.should_listen: